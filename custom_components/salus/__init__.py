@@ -1,10 +1,147 @@
 """The Salus component."""
+import datetime
+import logging
+import os
+import time
+
+import voluptuous as vol
+
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-from .const import DOMAIN
+from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.core import HomeAssistant, ServiceCall, SupportsResponse
+from homeassistant.exceptions import HomeAssistantError
+import homeassistant.helpers.config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DOMAIN,
+    DATA_HISTORY,
+    DATA_PHASES,
+    DATA_SNAPSHOTS,
+    SERVICE_EXPORT,
+    SERVICE_GET_TEMPERATURE_HISTORY,
+)
+from .export import EXPORT_DIR, FORMATS, write_export
+from .history import TIERS
+from .phasing import PhaseAllocator
+from .snapshot import SalusSnapshotView, SnapshotCache
+
+_LOGGER = logging.getLogger(__name__)
 
 PLATFORMS = ["climate", "sensor"]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+GET_TEMPERATURE_HISTORY_SCHEMA = vol.Schema({
+    vol.Required(ATTR_ENTITY_ID): cv.entity_id,
+    vol.Optional("window"): vol.In(list(TIERS)),
+})
+
+EXPORT_SCHEMA = vol.Schema({
+    vol.Required(ATTR_ENTITY_ID): cv.entity_ids,
+    vol.Optional("start"): cv.datetime,
+    vol.Optional("end"): cv.datetime,
+    vol.Optional("format", default="csv"): vol.In(list(FORMATS)),
+    vol.Optional("filename"): cv.string,
+})
+
+# How far back an export reaches when no start is given
+DEFAULT_EXPORT_PERIOD = datetime.timedelta(days=31)
+
+
+def _as_aware(value):
+    """Read a naive datetime in Home Assistant's configured time zone."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=dt_util.DEFAULT_TIME_ZONE)
+    return value
+
+
+async def async_setup(hass: HomeAssistant, config) -> bool:
+    """Set up the Salus services, the snapshot endpoint and poll phasing."""
+    hass.data.setdefault(DOMAIN, {})
+    hass.data[DOMAIN].setdefault(DATA_HISTORY, {})
+    hass.data[DOMAIN][DATA_PHASES] = PhaseAllocator()
+    hass.data[DOMAIN][DATA_SNAPSHOTS] = SnapshotCache()
+    hass.http.register_view(SalusSnapshotView(hass.data[DOMAIN][DATA_SNAPSHOTS]))
+
+    async def async_get_temperature_history(call: ServiceCall):
+        """Answer min/max/avg queries from the in-memory history."""
+        entity_id = call.data[ATTR_ENTITY_ID]
+        history = hass.data[DOMAIN][DATA_HISTORY].get(entity_id)
+        if history is None:
+            raise HomeAssistantError(f"{entity_id} has no Salus temperature history")
+
+        now = time.time()
+        window = call.data.get("window")
+        if window:
+            return {window: history.temperature.summary(window, now)}
+        return history.temperature.summaries(now)
+
+    async def async_export(call: ServiceCall):
+        """Stream the integration-owned history to a file in EXPORT_DIR."""
+        histories = hass.data[DOMAIN][DATA_HISTORY]
+        snapshots = []
+        for entity_id in call.data[ATTR_ENTITY_ID]:
+            if entity_id not in histories:
+                raise HomeAssistantError(f"{entity_id} has no Salus history")
+            snapshots.append((entity_id, histories[entity_id].to_dict()))
+        oldest = [histories[entity_id].first() for entity_id, _ in snapshots]
+
+        end = _as_aware(call.data.get("end") or dt_util.now())
+        start = _as_aware(call.data.get("start") or end - DEFAULT_EXPORT_PERIOD)
+        if start >= end:
+            raise HomeAssistantError("start must be before end")
+        file_format = call.data["format"]
+        filename = call.data.get("filename") or (
+            f"salus_export_{dt_util.now().strftime('%Y%m%d_%H%M%S')}.{file_format}"
+        )
+        if os.path.basename(filename) != filename:
+            raise HomeAssistantError("filename must not contain a directory")
+        if not filename.endswith(f".{file_format}"):
+            filename = f"{filename}.{file_format}"
+        path = hass.config.path(EXPORT_DIR, filename)
+
+        try:
+            lines = await hass.async_add_executor_job(
+                write_export,
+                path,
+                snapshots,
+                dt_util.as_timestamp(start),
+                dt_util.as_timestamp(end),
+                file_format,
+            )
+        except OSError as err:
+            raise HomeAssistantError(f"Could not write {path}: {err}") from err
+
+        response = {"path": path, "lines": lines}
+        held_since = [first for first in oldest if first is not None]
+        if len(held_since) < len(oldest) or max(held_since) > dt_util.as_timestamp(start):
+            since = dt_util.utc_from_timestamp(max(held_since)) if held_since else None
+            response["warning"] = (
+                f"The requested start is older than the history held by the "
+                f"integration (since {since.isoformat() if since else 'never'}); "
+                "the export only covers the period that is held"
+            )
+            _LOGGER.warning("Salus export %s: %s", path, response["warning"])
+        return response
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_TEMPERATURE_HISTORY,
+        async_get_temperature_history,
+        schema=GET_TEMPERATURE_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_EXPORT,
+        async_export,
+        schema=EXPORT_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    return True
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Salus integration from a config entry."""
     # Store the config entry data in hass.data
@@ -22,4 +159,3 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     if unload_ok:
         hass.data[DOMAIN].pop(entry.entry_id)
     return unload_ok
-
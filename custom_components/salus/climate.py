@@ -23,6 +23,7 @@ from homeassistant.const import (
     CONF_ID,
     UnitOfTemperature,
 )
+from homeassistant.core import callback
 
 try:
     from homeassistant.components.climate import ClimateEntity
@@ -30,6 +31,8 @@ except ImportError:
     from homeassistant.components.climate import ClimateDevice as ClimateEntity
 
 from . import DOMAIN
+from .const import DATA_PHASES, DATA_SNAPSHOTS
+from .phasing import PhasedPollMixin
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -45,6 +48,39 @@ MAX_TEMP = 34.5
 
 SUPPORT_FLAGS = ClimateEntityFeature.TARGET_TEMPERATURE
 
+# Tokens are refreshed every TOKEN_LIFETIME seconds, at each thermostat's own
+# phase of that period, so the tokens of many thermostats do not all expire
+# together. The first refresh after a login may come earlier to reach it.
+TOKEN_LIFETIME = 3600
+TOKEN_PHASE_GROUP = "token"
+
+# Device values returned by ajax_device_values.php; the control page embeds
+# the same keys and set.php may echo them back.
+REQUIRED_VALUE_KEYS = ("CH1currentSetPoint", "CH1currentRoomTemp")
+VALUE_KEYS = REQUIRED_VALUE_KEYS + ("frost", "CH1heatOnOffStatus", "CH1heatOnOff")
+
+# <input id="CH1currentRoomTemp" type="hidden" value="21.5" />
+HTML_VALUE_RE = re.compile(r'<input[^>]*\bid="(\w+)"[^>]*\bvalue="([^"]*)"')
+# "CH1currentRoomTemp":"21.5" inside an embedded script
+SCRIPT_VALUE_RE = re.compile(r'["\'](\w+)["\']\s*:\s*["\']?(-?[\w.]+)')
+
+
+def parse_device_values(text):
+    """
+    Extract the device values embedded in a Salus HTML page.
+
+    Returns a dict shaped like the ajax_device_values.php JSON, or None if
+    the page does not carry at least the room temperature and set point.
+    """
+    values = {}
+    for regex in (SCRIPT_VALUE_RE, HTML_VALUE_RE):
+        for key, value in regex.findall(text):
+            if key in VALUE_KEYS:
+                values[key] = value
+    if not all(key in values for key in REQUIRED_VALUE_KEYS):
+        return None
+    return values
+
 
 async def async_setup_entry(hass, entry, async_add_entities):
     """Set up the climate entity from a config entry."""
@@ -55,17 +91,19 @@ async def async_setup_entry(hass, entry, async_add_entities):
     password = config_data.get(CONF_PASSWORD)
     device_id = config_data.get(CONF_ID)
 
+    snapshots = hass.data[DOMAIN][DATA_SNAPSHOTS]
+
     # Create and add a single SalusThermostat entity
     async_add_entities(
-        [SalusThermostat(name, username, password, device_id)],
+        [SalusThermostat(name, username, password, device_id, snapshots)],
         update_before_add=True,
     )
 
 
-class SalusThermostat(ClimateEntity):
+class SalusThermostat(PhasedPollMixin, ClimateEntity):
     """Representation of a Salus Thermostat device."""
 
-    def __init__(self, name, username, password, device_id):
+    def __init__(self, name, username, password, device_id, snapshots):
         """Initialize the thermostat."""
         self._name = name
         self._username = username
@@ -78,7 +116,46 @@ class SalusThermostat(ClimateEntity):
         self._current_operation_mode = None
         self._token = None
         self._token_timestamp = None
+        self._token_offset = 0.0
+        self._token_deadline = None
+        # complete values from the control page or a set.php echo replace the
+        # next scheduled ajax_device_values.php request
+        self._skip_next_fetch = False
         self._session = requests.Session()
+        self._snapshots = snapshots
+
+    async def async_added_to_hass(self):
+        """Take a token refresh phase and publish the first reading."""
+        await super().async_added_to_hass()
+        if self._current_temperature is not None:
+            self._snapshots.async_publish(self._id, self._snapshot_values())
+        self.hass.data[DOMAIN][DATA_PHASES].async_register(
+            TOKEN_PHASE_GROUP, self.entity_id, self._async_rebalance_token
+        )
+
+    async def async_will_remove_from_hass(self):
+        """Drop this device from the snapshot cache and the token phases."""
+        await super().async_will_remove_from_hass()
+        self.hass.data[DOMAIN][DATA_PHASES].async_unregister(
+            TOKEN_PHASE_GROUP, self.entity_id
+        )
+        self._snapshots.async_remove(self._id)
+
+    @callback
+    def _async_rebalance_token(self):
+        self._token_offset = self.hass.data[DOMAIN][DATA_PHASES].offset(
+            TOKEN_PHASE_GROUP, self.entity_id, TOKEN_LIFETIME
+        )
+        # the first login runs in update_before_add, before this thermostat
+        # had a phase, and joins or leaves move the phase: keep the pending
+        # refresh on it
+        if self._token_timestamp is not None:
+            self._token_deadline = self._next_token_refresh(self._token_timestamp)
+
+    def _next_token_refresh(self, timestamp):
+        """Return the first refresh phase of this thermostat after timestamp."""
+        delay = (self._token_offset - timestamp) % TOKEN_LIFETIME
+        return timestamp + (delay or TOKEN_LIFETIME)
 
     @property
     def supported_features(self):
@@ -97,8 +174,8 @@ class SalusThermostat(ClimateEntity):
 
     @property
     def should_poll(self):
-        """Return if polling is required."""
-        return True
+        """Polling is scheduled at this thermostat's phase by PhasedPollMixin."""
+        return False
 
     @property
     def min_temp(self):
@@ -188,6 +265,8 @@ class SalusThermostat(ClimateEntity):
         if temperature is None:
             return
         self._set_temperature(temperature)
+        # not polled by Home Assistant, so write the new state ourselves
+        self.schedule_update_ha_state()
 
     def _set_temperature(self, temperature):
         """Set new target temperature, via URL commands."""
@@ -202,6 +281,7 @@ class SalusThermostat(ClimateEntity):
         response = self._session.post(URL_SET_DATA, data=payload, headers=headers)
         if response and response.status_code == 200:
             self._target_temperature = temperature
+            self._apply_set_response(response)
 
     def set_hvac_mode(self, hvac_mode):
         """Set HVAC mode, via URL commands."""
@@ -211,11 +291,15 @@ class SalusThermostat(ClimateEntity):
             response = self._session.post(URL_SET_DATA, data=payload, headers=headers)
             if response and response.status_code == 200:
                 self._current_operation_mode = "OFF"
+                self._apply_set_response(response)
         elif hvac_mode == HVACMode.HEAT:
             payload = {"token": self._token, "devId": self._id, "auto": "0", "auto_setZ1": "1"}
             response = self._session.post(URL_SET_DATA, data=payload, headers=headers)
             if response and response.status_code == 200:
                 self._current_operation_mode = "ON"
+                self._apply_set_response(response)
+        # not polled by Home Assistant, so write the new state ourselves
+        self.schedule_update_ha_state()
 
     def get_token(self):
         """Get the Session Token of the Thermostat."""
@@ -234,20 +318,86 @@ class SalusThermostat(ClimateEntity):
             if result:
                 self._token = result.group(1)
                 self._token_timestamp = int(time.time())
+                self._token_deadline = self._next_token_refresh(self._token_timestamp)
                 _LOGGER.info("Got new token. Timestamp: %s", self._token_timestamp)
 
+            # the control page already carries the current device values
+            data = parse_device_values(get_token_resp.text)
+            if data:
+                _LOGGER.debug("Using the device values embedded in the control page.")
+                if self._apply_values(data):
+                    self._skip_next_fetch = True
+
+    def _apply_set_response(self, response):
+        """Use the device state echoed back by set.php, if there is any."""
+        try:
+            data = response.json()
+        except ValueError:
+            data = None
+        if not isinstance(data, dict) or not all(key in data for key in REQUIRED_VALUE_KEYS):
+            # nothing echoed back: keep the optimistic value set by the caller
+            self._publish_snapshot()
+            return
+        if self._apply_values(data):
+            self._skip_next_fetch = True
+
+    def _apply_values(self, data):
+        """
+        Store device values shaped like the ajax_device_values.php JSON.
+
+        Only the keys present in data are applied. Return True when every key
+        was present, so the values can replace the next ajax fetch.
+        """
+        try:
+            temperatures = {
+                key: float(data[key])
+                for key in ("CH1currentSetPoint", "CH1currentRoomTemp", "frost")
+                if key in data
+            }
+        except (TypeError, ValueError):
+            _LOGGER.error("Invalid device values returned from Salus.")
+            self._publish_unavailable()
+            return False
+
+        if "CH1currentSetPoint" in temperatures:
+            self._target_temperature = temperatures["CH1currentSetPoint"]
+        if "CH1currentRoomTemp" in temperatures:
+            self._current_temperature = temperatures["CH1currentRoomTemp"]
+        if "frost" in temperatures:
+            self._frost = temperatures["frost"]
+
+        # On/Off status
+        if "CH1heatOnOffStatus" in data:
+            self._status = "ON" if data["CH1heatOnOffStatus"] == "1" else "OFF"
+
+        # Manual/Auto mode
+        if "CH1heatOnOff" in data:
+            if data["CH1heatOnOff"] == "1":
+                self._current_operation_mode = "OFF"
+            else:
+                self._current_operation_mode = "ON"
+
+        self._publish_snapshot()
+        return all(key in data for key in VALUE_KEYS)
+
     def _get_data(self):
         """Retrieve data from the device."""
         cur_timestamp = int(time.time())
         _LOGGER.debug("Starting _get_data. Timestamp: %s", cur_timestamp)
 
-        # if no token or token older than 1h, re-login
-        if self._token is None or (cur_timestamp - (self._token_timestamp or 0)) > 3600:
+        # if no token or past this thermostat's refresh phase, re-login
+        if self._token is None or cur_timestamp >= (self._token_deadline or 0):
             _LOGGER.debug("No token or token expired, calling get_token().")
             self.get_token()
 
         if not self._token:
             _LOGGER.error("Could not get a valid token from Salus.")
+            self._publish_unavailable()
+            return
+
+        if self._skip_next_fetch:
+            self._skip_next_fetch = False
+            _LOGGER.debug("Device values are fresh, skipping ajax_device_values.php.")
             return
 
         params = {
@@ -261,27 +411,46 @@ class SalusThermostat(ClimateEntity):
                 data = r.json()
             except ValueError:
                 _LOGGER.error("Invalid JSON returned from Salus.")
+                self._publish_unavailable()
                 return
 
-            self._target_temperature = float(data.get("CH1currentSetPoint", 0))
-            self._current_temperature = float(data.get("CH1currentRoomTemp", 0))
-            self._frost = float(data.get("frost", 0))
-
-            # On/Off status
-            status = data.get("CH1heatOnOffStatus", "0")
-            self._status = "ON" if status == "1" else "OFF"
-
-            # Manual/Auto mode
-            mode = data.get("CH1heatOnOff", "1")
-            if mode == "1":
-                self._current_operation_mode = "OFF"
-            else:
-                self._current_operation_mode = "ON"
+            self._apply_values(data)
         else:
             _LOGGER.error(
                 "Could not get data from Salus (status_code=%s).",
                 r.status_code if r else "No response",
             )
+            self._publish_unavailable()
+
+    def _snapshot_values(self):
+        return {
+            "name": self._name,
+            "entity_id": self.entity_id,
+            "current_temperature": self._current_temperature,
+            "target_temperature": self._target_temperature,
+            "frost": self._frost,
+            "status": self._status,
+            "mode": self._current_operation_mode,
+        }
+
+    def _publish_snapshot(self):
+        """Hand the latest parsed values to the local snapshot endpoint."""
+        # update_before_add runs before entity_id is set; async_added_to_hass
+        # publishes that first reading instead
+        if self.entity_id is None:
+            return
+        # update() runs in the executor, the cache lives in the event loop
+        self.hass.loop.call_soon_threadsafe(
+            self._snapshots.async_publish, self._id, self._snapshot_values()
+        )
+
+    def _publish_unavailable(self):
+        """Tell the local snapshot endpoint that the last poll failed."""
+        if self.entity_id is None:
+            return
+        self.hass.loop.call_soon_threadsafe(
+            self._snapshots.async_mark_unavailable, self._id
+        )
 
     def update(self):
         """Get the latest data from Salus."""
@@ -1 +1,9 @@
-DOMAIN = "salus"
\ No newline at end of file
+DOMAIN = "salus"
+
+# hass.data[DOMAIN] keys shared between the platforms
+DATA_HISTORY = "history"
+DATA_SNAPSHOTS = "snapshots"
+DATA_PHASES = "phases"
+
+SERVICE_GET_TEMPERATURE_HISTORY = "get_temperature_history"
+SERVICE_EXPORT = "export"
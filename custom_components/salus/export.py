@@ -0,0 +1,129 @@
+"""
+Export of the integration-owned Salus history to CSV or JSON lines.
+
+The export is a generator pipeline: records -> formatted lines -> chunks.
+Only one chunk is held in memory at a time, and the file is written to a
+temporary name in EXPORT_DIR and renamed once complete. Existing files are
+never overwritten.
+"""
+import csv
+import io
+import json
+import os
+
+from homeassistant.util import dt as dt_util
+
+from .history import ThermostatHistory
+
+FIELDS = ("entity_id", "kind", "resolution", "start", "end", "min", "max", "avg", "samples")
+
+# Sub-directory of the config directory that receives the exports
+EXPORT_DIR = "salus_exports"
+
+# Number of records written per chunk
+CHUNK_SIZE = 500
+
+
+def _isoformat(timestamp):
+    if timestamp is None:
+        return None
+    return dt_util.as_local(dt_util.utc_from_timestamp(timestamp)).isoformat()
+
+
+def iter_records(histories, start, end):
+    """Yield one record per temperature bucket and heating interval."""
+    for entity_id, history in histories:
+        for window, bucket_start, low, high, avg, count in history.temperature.series(start, end):
+            resolution = history.temperature.resolution(window)
+            yield {
+                "entity_id": entity_id,
+                "kind": "temperature",
+                "resolution": resolution,
+                "start": _isoformat(bucket_start),
+                "end": _isoformat(bucket_start + resolution),
+                "min": round(low, 2),
+                "max": round(high, 2),
+                "avg": round(avg, 2),
+                "samples": count,
+            }
+        for interval_start, interval_end in history.heating.intervals(start, end):
+            yield {
+                "entity_id": entity_id,
+                "kind": "heating",
+                "resolution": None,
+                "start": _isoformat(interval_start),
+                "end": _isoformat(interval_end),
+                "min": None,
+                "max": None,
+                "avg": None,
+                "samples": None,
+            }
+
+
+def iter_csv(records):
+    """Format records as CSV lines, header first."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=FIELDS)
+    writer.writeheader()
+    yield buffer.getvalue()
+    for record in records:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerow(record)
+        yield buffer.getvalue()
+
+
+def iter_jsonl(records):
+    """Format records as JSON lines."""
+    for record in records:
+        yield json.dumps(record) + "\n"
+
+
+FORMATS = {
+    "csv": iter_csv,
+    "jsonl": iter_jsonl,
+}
+
+
+def iter_chunks(lines, size=CHUNK_SIZE):
+    """Group lines into chunks of at most size lines."""
+    chunk = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= size:
+            yield "".join(chunk)
+            chunk = []
+    if chunk:
+        yield "".join(chunk)
+
+
+def write_export(path, snapshots, start, end, file_format):
+    """
+    Write the export file; runs in the executor.
+
+    snapshots are (entity_id, ThermostatHistory.to_dict()) pairs taken in
+    the event loop, so the live histories are never read from this thread.
+    Returns the number of lines written.
+    """
+    histories = (
+        (entity_id, ThermostatHistory.from_dict(data)) for entity_id, data in snapshots
+    )
+    lines = FORMATS[file_format](iter_records(histories, start, end))
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if os.path.exists(path):
+        raise FileExistsError(f"{path} already exists")
+
+    written = 0
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8", newline="") as handle:
+            for chunk in iter_chunks(lines):
+                handle.write(chunk)
+                written += chunk.count("\n")
+        os.replace(tmp_path, path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return written
@@ -0,0 +1,384 @@
+"""
+In-memory history of a Salus thermostat.
+
+TemperatureHistory keeps multi-resolution temperature tiers. Every tier is a
+fixed-size ring of buckets backed by preallocated arrays. Each bucket keeps
+the min, max, sum and count of the samples that fell into it, and every tier
+keeps running aggregates over its whole window so that min/max/avg can be
+answered without walking the buckets.
+
+HeatingLog keeps the intervals during which the thermostat was heating.
+"""
+from array import array
+from collections import deque
+
+# name: (bucket resolution in seconds, number of buckets), finest first
+TIERS = {
+    "hour": (15, 240),       # raw 15-second samples for the last hour
+    "day": (300, 288),       # 5-minute buckets for the last day
+    "month": (3600, 744),    # hourly buckets for the last 31 days
+    "year": (86400, 366),    # daily (UTC) buckets for the last year
+}
+
+
+class _Tier:
+    """A ring of fixed-width buckets covering a sliding time window."""
+
+    def __init__(self, resolution, size):
+        self.resolution = resolution
+        self.size = size
+        # bucket index (timestamp // resolution) stored in each slot, -1 = empty
+        self._index = array("q", [-1]) * size
+        self._min = array("d", [0.0]) * size
+        self._max = array("d", [0.0]) * size
+        self._sum = array("d", [0.0]) * size
+        self._count = array("L", [0]) * size
+        # running aggregates over the buckets still inside the window
+        self._total = 0.0
+        self._samples = 0
+        self._tail = None
+        self._head = None
+        # monotonic queues of bucket indices for sliding min / max
+        self._mins = deque(maxlen=size)
+        self._maxs = deque(maxlen=size)
+
+    def _slot(self, index):
+        return index % self.size
+
+    def _reset(self):
+        for slot in range(self.size):
+            self._index[slot] = -1
+        self._total = 0.0
+        self._samples = 0
+        self._tail = None
+        self._head = None
+        self._mins.clear()
+        self._maxs.clear()
+
+    def _expire(self, index):
+        """Drop every bucket that is older than the window ending at index."""
+        if self._tail is None:
+            return
+        oldest = index - self.size + 1
+        if oldest - self._tail >= self.size:
+            self._reset()
+            return
+        while self._tail < oldest:
+            slot = self._slot(self._tail)
+            if self._index[slot] == self._tail:
+                self._total -= self._sum[slot]
+                self._samples -= self._count[slot]
+                self._index[slot] = -1
+            self._tail += 1
+        while self._mins and self._mins[0] < oldest:
+            self._mins.popleft()
+        while self._maxs and self._maxs[0] < oldest:
+            self._maxs.popleft()
+
+    def _push_extremes(self, index, slot):
+        # only the newest bucket ever changes, so drop its stale entry first
+        if self._mins and self._mins[-1] == index:
+            self._mins.pop()
+        while self._mins and self._min[self._slot(self._mins[-1])] >= self._min[slot]:
+            self._mins.pop()
+        self._mins.append(index)
+
+        if self._maxs and self._maxs[-1] == index:
+            self._maxs.pop()
+        while self._maxs and self._max[self._slot(self._maxs[-1])] <= self._max[slot]:
+            self._maxs.pop()
+        self._maxs.append(index)
+
+    def merge(self, index, low, high, total, count):
+        """Merge an aggregate into the bucket at index (must not go backwards)."""
+        if count <= 0 or (self._head is not None and index < self._head):
+            return
+        self._expire(index)
+        slot = self._slot(index)
+        if self._index[slot] != index:
+            self._index[slot] = index
+            self._min[slot] = low
+            self._max[slot] = high
+            self._sum[slot] = total
+            self._count[slot] = count
+        else:
+            self._min[slot] = min(self._min[slot], low)
+            self._max[slot] = max(self._max[slot], high)
+            self._sum[slot] += total
+            self._count[slot] += count
+        self._total += total
+        self._samples += count
+        if self._tail is None:
+            self._tail = index
+        self._head = index
+        self._push_extremes(index, slot)
+
+    def add(self, timestamp, value):
+        """Add a single sample taken at timestamp (seconds since epoch)."""
+        self.merge(int(timestamp // self.resolution), value, value, value, 1)
+
+    def summary(self, timestamp):
+        """Return min/max/avg over the window ending at timestamp."""
+        self._expire(int(timestamp // self.resolution))
+        if not self._samples:
+            return None
+        return {
+            "min": self._min[self._slot(self._mins[0])],
+            "max": self._max[self._slot(self._maxs[0])],
+            "avg": self._total / self._samples,
+            "count": self._samples,
+        }
+
+    def first(self):
+        """Return the start time of the oldest bucket, or None when empty."""
+        if self._tail is None:
+            return None
+        for index in range(self._tail, self._head + 1):
+            if self._index[self._slot(index)] == index:
+                return index * self.resolution
+        return None
+
+    def count(self, start, end):
+        """Return the number of samples in the buckets starting in [start, end)."""
+        if self._tail is None:
+            return 0
+        total = 0
+        first = max(self._tail, -(-start // self.resolution))
+        last = min(self._head, (end - 1) // self.resolution)
+        for index in range(first, last + 1):
+            slot = self._slot(index)
+            if self._index[slot] == index:
+                total += self._count[slot]
+        return total
+
+    def buckets(self, start=None, end=None):
+        """Yield (start, min, max, avg, count) for each bucket, oldest first."""
+        if self._tail is None:
+            return
+        for index in range(self._tail, self._head + 1):
+            slot = self._slot(index)
+            if self._index[slot] != index:
+                continue
+            bucket_start = index * self.resolution
+            if start is not None and bucket_start + self.resolution <= start:
+                continue
+            if end is not None and bucket_start >= end:
+                break
+            yield (
+                bucket_start,
+                self._min[slot],
+                self._max[slot],
+                self._sum[slot] / self._count[slot],
+                self._count[slot],
+            )
+
+    def to_list(self):
+        """Return the valid buckets as compact [index, min, max, sum, count] rows."""
+        rows = []
+        if self._tail is None:
+            return rows
+        for index in range(self._tail, self._head + 1):
+            slot = self._slot(index)
+            if self._index[slot] == index:
+                rows.append([
+                    index,
+                    round(self._min[slot], 2),
+                    round(self._max[slot], 2),
+                    round(self._sum[slot], 2),
+                    self._count[slot],
+                ])
+        return rows
+
+
+class TemperatureHistory:
+    """Downsampled temperature history with O(1) min/max/avg per window."""
+
+    def __init__(self):
+        self._tiers = {
+            name: _Tier(resolution, size) for name, (resolution, size) in TIERS.items()
+        }
+
+    def add(self, timestamp, value):
+        """Record a temperature sample in every tier."""
+        for tier in self._tiers.values():
+            tier.add(timestamp, value)
+
+    def resolution(self, window):
+        """Return the bucket width of one window, in seconds."""
+        return self._tiers[window].resolution
+
+    def summary(self, window, timestamp):
+        """Return the aggregates of one window ("hour", "day", "month" or "year")."""
+        return self._tiers[window].summary(timestamp)
+
+    def summaries(self, timestamp):
+        """Return the aggregates of every window."""
+        return {name: tier.summary(timestamp) for name, tier in self._tiers.items()}
+
+    def buckets(self, window, start=None, end=None):
+        """Yield the buckets of one window between start and end."""
+        return self._tiers[window].buckets(start, end)
+
+    def series(self, start, end):
+        """
+        Yield (window, start, min, max, avg, count) covering [start, end).
+
+        Each period comes from the finest tier that still holds it: daily
+        buckets for the oldest part, then hourly buckets, 5-minute buckets
+        and finally raw samples. A finer tier only takes over at a bucket
+        boundary of the coarser one, and only from a coarse bucket whose
+        samples it holds completely, so no sample is reported twice.
+        """
+        names = list(self._tiers)
+        spans = []
+        lower = start
+        for position in range(len(names) - 1, 0, -1):
+            coarse = self._tiers[names[position]]
+            fine = self._tiers[names[position - 1]]
+            first = fine.first()
+            if first is None:
+                boundary = end
+            else:
+                boundary = first - first % coarse.resolution
+                if fine.count(boundary, boundary + coarse.resolution) != coarse.count(
+                    boundary, boundary + coarse.resolution
+                ):
+                    boundary += coarse.resolution
+            # boundaries of coarser tiers are aligned to this tier as well
+            boundary = min(max(boundary, lower), end)
+            spans.append((names[position], lower, boundary))
+            lower = boundary
+        spans.append((names[0], lower, end))
+
+        for name, lower, upper in spans:
+            lower = max(lower, start)
+            if lower >= upper:
+                continue
+            for bucket in self._tiers[name].buckets(lower, upper):
+                yield (name,) + bucket
+
+    def first(self):
+        """Return the start time of the oldest bucket of any tier, or None."""
+        starts = [tier.first() for tier in self._tiers.values()]
+        starts = [start for start in starts if start is not None]
+        return min(starts) if starts else None
+
+    def to_dict(self):
+        """Return a compact, JSON serialisable representation."""
+        return {name: tier.to_list() for name, tier in self._tiers.items()}
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a history from the output of to_dict()."""
+        history = cls()
+        for name, tier in history._tiers.items():
+            for row in sorted(data.get(name) or [], key=lambda row: row[0]):
+                index, low, high, total, count = row
+                tier.merge(int(index), float(low), float(high), float(total), int(count))
+        return history
+
+
+class HeatingLog:
+    """Ring of the most recent heating intervals, oldest first."""
+
+    def __init__(self, size=8192):
+        self.size = size
+        self._start = array("d", [0.0]) * size
+        self._end = array("d", [0.0]) * size
+        self._next = 0
+        self._length = 0
+        # start of the interval that is still running, if any
+        self._since = None
+        # time of the last recorded sample
+        self._last_seen = None
+
+    def record(self, timestamp, heating):
+        """Record whether the thermostat is heating at timestamp."""
+        self._last_seen = timestamp
+        if heating and self._since is None:
+            self._since = timestamp
+        elif not heating and self._since is not None:
+            self._append(self._since, timestamp)
+            self._since = None
+
+    def _append(self, start, end):
+        self._start[self._next] = start
+        self._end[self._next] = end
+        self._next = (self._next + 1) % self.size
+        self._length = min(self._length + 1, self.size)
+
+    def intervals(self, start, end):
+        """Yield the (start, end) heating intervals overlapping [start, end)."""
+        first = (self._next - self._length) % self.size
+        for offset in range(self._length):
+            slot = (first + offset) % self.size
+            if self._end[slot] <= start:
+                continue
+            if self._start[slot] >= end:
+                return
+            yield self._start[slot], self._end[slot]
+        if self._since is not None and self._since < end:
+            yield self._since, None
+
+    def first(self):
+        """Return the start of the oldest interval held, or None."""
+        if self._length:
+            return self._start[(self._next - self._length) % self.size]
+        return self._since
+
+    def to_dict(self):
+        """Return a compact, JSON serialisable representation."""
+        first = (self._next - self._length) % self.size
+        intervals = []
+        for offset in range(self._length):
+            slot = (first + offset) % self.size
+            intervals.append([int(self._start[slot]), int(self._end[slot])])
+        return {"intervals": intervals, "since": self._since, "last_seen": self._last_seen}
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Rebuild a log from the output of to_dict().
+
+        An interval that was still running is closed at the last recorded
+        sample: nothing is known about the time after it (e.g. while Home
+        Assistant was stopped), so it must not count as heating.
+        """
+        log = cls()
+        for start, end in data.get("intervals") or []:
+            log._append(float(start), float(end))
+        if data.get("last_seen") is not None:
+            log._last_seen = float(data["last_seen"])
+        if data.get("since") is not None:
+            since = float(data["since"])
+            log._append(since, max(since, log._last_seen or since))
+        return log
+
+
+class ThermostatHistory:
+    """Everything the integration remembers about one thermostat."""
+
+    def __init__(self, temperature=None, heating=None):
+        self.temperature = temperature or TemperatureHistory()
+        self.heating = heating or HeatingLog()
+
+    def first(self):
+        """Return the oldest time covered by any of the history, or None."""
+        starts = [self.temperature.first(), self.heating.first()]
+        starts = [start for start in starts if start is not None]
+        return min(starts) if starts else None
+
+    def to_dict(self):
+        """Return a compact, JSON serialisable representation."""
+        return {
+            "temperature": self.temperature.to_dict(),
+            "heating": self.heating.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild the history from the output of to_dict()."""
+        return cls(
+            TemperatureHistory.from_dict(data.get("temperature") or {}),
+            HeatingLog.from_dict(data.get("heating") or {}),
+        )
@@ -0,0 +1,117 @@
+"""
+Staggered polling for Salus entities.
+
+Instead of letting Home Assistant poll every entity on the same tick, each
+entity registers with the PhaseAllocator and gets its own offset within
+the poll interval. The thermostats use the same allocator to stagger their
+token refreshes. Offsets are spread evenly over the interval and
+rebalanced whenever an entity is added or removed, so many thermostats and
+config entries produce a flat stream of requests instead of bursts.
+"""
+import time
+
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import DATA_PHASES, DOMAIN
+
+
+class PhaseAllocator:
+    """Spreads the members of each group evenly over an interval."""
+
+    def __init__(self):
+        # group -> {key: rebalance callback}, in join order
+        self._groups = {}
+
+    @callback
+    def async_register(self, group, key, on_rebalance=None):
+        """Add key to group and rebalance that group."""
+        self._groups.setdefault(group, {})[key] = on_rebalance
+        self._rebalance(group)
+
+    @callback
+    def async_unregister(self, group, key):
+        """Remove key from group and rebalance that group."""
+        members = self._groups.get(group)
+        if members is None or key not in members:
+            return
+        del members[key]
+        if members:
+            self._rebalance(group)
+        else:
+            del self._groups[group]
+
+    def _rebalance(self, group):
+        for on_rebalance in list(self._groups.get(group, {}).values()):
+            if on_rebalance is not None:
+                on_rebalance()
+
+    def offset(self, group, key, interval):
+        """Return the offset of key within interval, in seconds."""
+        members = list(self._groups.get(group, {}))
+        if key not in members:
+            return 0.0
+        return interval * members.index(key) / len(members)
+
+    def delay(self, group, key, interval, now):
+        """Return the seconds from now until the next phase of key."""
+        delay = (self.offset(group, key, interval) - now) % interval
+        return delay or interval
+
+
+class PhasedPollMixin:
+    """
+    Poll the entity at its own phase instead of Home Assistant's shared tick.
+
+    The interval is the platform's scan interval (SCAN_INTERVAL of the
+    platform module), so the poll rate does not change, only its timing.
+    """
+
+    _attr_should_poll = False
+    _phase_unsub = None
+    _phase_interval = None
+    _phase_group = None
+    _phase_active = False
+
+    async def async_added_to_hass(self):
+        """Join the phase allocator."""
+        await super().async_added_to_hass()
+        self._phase_interval = self.platform.scan_interval.total_seconds()
+        self._phase_group = ("poll", self._phase_interval)
+        self._phase_active = True
+        self.hass.data[DOMAIN][DATA_PHASES].async_register(
+            self._phase_group, self.entity_id, self._async_schedule_phase
+        )
+
+    async def async_will_remove_from_hass(self):
+        """Leave the phase allocator."""
+        self._phase_active = False
+        self._async_cancel_phase()
+        self.hass.data[DOMAIN][DATA_PHASES].async_unregister(
+            self._phase_group, self.entity_id
+        )
+        await super().async_will_remove_from_hass()
+
+    @callback
+    def _async_cancel_phase(self):
+        if self._phase_unsub is not None:
+            self._phase_unsub()
+            self._phase_unsub = None
+
+    @callback
+    def _async_schedule_phase(self):
+        """(Re)schedule the next poll at this entity's current phase."""
+        self._async_cancel_phase()
+        delay = self.hass.data[DOMAIN][DATA_PHASES].delay(
+            self._phase_group, self.entity_id, self._phase_interval, time.time()
+        )
+        self._phase_unsub = async_call_later(self.hass, delay, self._async_phase_poll)
+
+    async def _async_phase_poll(self, _now):
+        self._phase_unsub = None
+        try:
+            await self.async_update_ha_state(True)
+        finally:
+            # removed while updating: do not come back
+            if self._phase_active:
+                self._async_schedule_phase()
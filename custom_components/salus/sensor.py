@@ -1,5 +1,6 @@
 import logging
 import datetime
+import time
 from datetime import timedelta
 
 from homeassistant.config_entries import ConfigEntry
@@ -14,10 +15,17 @@ from homeassistant.const import (
 )
 
 from . import DOMAIN
+from .const import DATA_HISTORY
+from .history import TIERS, ThermostatHistory
+from .phasing import PhasedPollMixin
+from .storage import AccumulatorStore, HistoryStore
 
 # Decrease poll interval to 15 seconds:
 SCAN_INTERVAL = timedelta(seconds=15)
 
+# Seconds between writes of the temperature history while it keeps changing
+HISTORY_SAVE_DELAY = 300
+
 _LOGGER = logging.getLogger(__name__)
 
 async def async_setup_entry(
@@ -32,19 +40,23 @@ async def async_setup_entry(
     # We assume your climate entity is called climate.salus_thermostat
     climate_entity_id = "climate.salus_thermostat"
 
+    # One validated load of all heating counters, shared by the sensors below
+    accumulators = AccumulatorStore(hass, entry.entry_id)
+    await accumulators.async_load()
+
     sensors = [
         StareTermostatSensor(climate_entity_id),
-        StatisticaCentralaSensor(climate_entity_id),
-        StatisticaCentralaIeriSensor(climate_entity_id),
-        StatisticaCentralaLunaCurentaSensor(climate_entity_id),
-        StatisticaCentralaLunaTrecutaSensor(climate_entity_id),
+        StatisticaCentralaSensor(climate_entity_id, accumulators),
+        StatisticaCentralaIeriSensor(climate_entity_id, accumulators),
+        StatisticaCentralaLunaCurentaSensor(climate_entity_id, accumulators),
+        StatisticaCentralaLunaTrecutaSensor(climate_entity_id, accumulators),
         DurataIncalzireSensor("sensor.thermostat_state"),  # references the sensor above
-        SalusCurrentTempSensor(climate_entity_id)          # <-- Your new temperature sensor
+        SalusCurrentTempSensor(climate_entity_id, entry.entry_id)  # <-- Your new temperature sensor
     ]
     async_add_entities(sensors, update_before_add=True)
 
 
-class StareTermostatSensor(SensorEntity):
+class StareTermostatSensor(PhasedPollMixin, SensorEntity):
     """
     Replaces:
       template:
@@ -71,7 +83,71 @@ class StareTermostatSensor(SensorEntity):
         self._state = climate_state.attributes.get("hvac_action", STATE_UNKNOWN)
 
 
-class StatisticaCentralaSensor(SensorEntity, RestoreEntity):
+class AccumulatorMixin:
+    """
+    Keeps the state of a heating counter in the shared AccumulatorStore.
+
+    Subclasses set _counter_key and translate their fields with
+    _to_counter() / _from_counter(). _from_legacy() migrates the attributes
+    that older versions stored through RestoreEntity.
+    """
+
+    _counter_key = None
+
+    def _restore_counter(self):
+        """Restore from the store; return False if there is nothing stored."""
+        counter = self._accumulators.get(self._counter_key)
+        if counter is None:
+            return False
+        self._last_update = counter["last_update"]
+        self._last_state = counter["last_state"]
+        self._from_counter(counter)
+        return True
+
+    def _save_counter(self, force=False):
+        self._accumulators.async_set(
+            self._counter_key,
+            {
+                "last_update": self._last_update,
+                "last_state": self._last_state,
+                **self._to_counter(),
+            },
+            force,
+        )
+
+    async def async_added_to_hass(self):
+        """Migrate the state restored by RestoreEntity if the store had none."""
+        await super().async_added_to_hass()
+        if self._restored:
+            return
+        last_state = await self.async_get_last_state()
+        if last_state:
+            try:
+                self._from_legacy(last_state)
+            except (KeyError, TypeError, ValueError) as err:
+                _LOGGER.warning("Could not restore %s: %s", self.entity_id, err)
+        self._restored = True
+        self._save_counter(force=True)
+
+    async def async_will_remove_from_hass(self):
+        """Write the counters before the entity goes away."""
+        await super().async_will_remove_from_hass()
+        await self._accumulators.async_flush()
+
+    def _from_legacy_common(self, attributes):
+        if "last_update" in attributes:
+            self._last_update = datetime.datetime.fromisoformat(attributes["last_update"])
+        if "last_state" in attributes:
+            self._last_state = attributes["last_state"]
+
+    def _hvac_action(self):
+        climate_state = self.hass.states.get(self._climate_entity_id)
+        if climate_state:
+            return climate_state.attributes.get("hvac_action", STATE_UNKNOWN)
+        return STATE_UNKNOWN
+
+
+class StatisticaCentralaSensor(PhasedPollMixin, AccumulatorMixin, SensorEntity, RestoreEntity):
     """
     Replaces:
       - platform: history_stats
@@ -82,41 +158,36 @@ class StatisticaCentralaSensor(SensorEntity, RestoreEntity):
         start: midnight
         end: now
 
-    Accumulates heating time in memory from midnight to current.
-    Resets daily at midnight. Loses info on HA restart.
+    Accumulates heating time from midnight to current.
+    Resets daily at midnight.
     """
-    def __init__(self, climate_entity_id):
+    _counter_key = "heater_history"
+
+    def __init__(self, climate_entity_id, accumulators):
         self._climate_entity_id = climate_entity_id
+        self._accumulators = accumulators
         self._attr_name = "Heater History"
         self._attr_unique_id = f"{climate_entity_id}_.heater_history"
         self._hours_heating = 0.0
         self._last_update = datetime.datetime.now()
         self._last_state = STATE_UNKNOWN
+        self._restored = self._restore_counter()
 
-    async def async_added_to_hass(self):
-        """Restore state on startup."""
-        await super().async_added_to_hass()
-        last_state = await self.async_get_last_state()
-        if last_state:
-            self._hours_heating = float(last_state.state)
-            attributes = last_state.attributes
-            if "last_update" in attributes:
-                self._last_update = datetime.datetime.fromisoformat(attributes["last_update"])
-            if "last_state" in attributes:
-                self._last_state = attributes["last_state"]
+    def _to_counter(self):
+        return {"total": self._hours_heating}
+
+    def _from_counter(self, counter):
+        self._hours_heating = counter["total"]
+
+    def _from_legacy(self, last_state):
+        self._hours_heating = float(last_state.state)
+        self._from_legacy_common(last_state.attributes)
 
     @property
     def state(self):
         return round(self._hours_heating, 2)
 
-    @property
-    def extra_state_attributes(self):
-        return {
-            "last_update": self._last_update.isoformat(),
-            "last_state": self._last_state,
-        }
-
-    def update(self):
+    async def async_update(self):
         now = datetime.datetime.now()
         climate_state = self.hass.states.get(self._climate_entity_id)
         if climate_state:
@@ -125,7 +196,8 @@ class StatisticaCentralaSensor(SensorEntity, RestoreEntity):
             hvac_action = STATE_UNAVAILABLE
 
         # reset if day changed
-        if now.date() != self._last_update.date():
+        rollover = now.date() != self._last_update.date()
+        if rollover:
             self._hours_heating = 0.0
 
         # accumulate if last state was "heating"
@@ -135,35 +207,39 @@ class StatisticaCentralaSensor(SensorEntity, RestoreEntity):
 
         self._last_state = hvac_action
         self._last_update = now
+        self._save_counter(force=rollover)
 
 
-class StatisticaCentralaIeriSensor(SensorEntity, RestoreEntity):
+class StatisticaCentralaIeriSensor(PhasedPollMixin, AccumulatorMixin, SensorEntity, RestoreEntity):
     """
     Tracks yesterday's heating time.
     Resets at midnight, storing the previous day's total.
     """
-    def __init__(self, climate_entity_id):
+    _counter_key = "yesterday_heater_history"
+
+    def __init__(self, climate_entity_id, accumulators):
         self._climate_entity_id = climate_entity_id
+        self._accumulators = accumulators
         self._attr_name = "Yesterday Heater History"
         self._attr_unique_id = f"{climate_entity_id}_yesterday_heater_history"
         self._state = 0.0  # yesterday's total
         self._today_heating = 0.0
         self._last_update = datetime.datetime.now()
         self._last_state = STATE_UNKNOWN
+        self._restored = self._restore_counter()
 
-    async def async_added_to_hass(self):
-        """Restore state on startup."""
-        await super().async_added_to_hass()
-        last_state = await self.async_get_last_state()
-        if last_state:
-            self._state = float(last_state.state)
-            attributes = last_state.attributes
-            if "today_heating" in attributes:
-                self._today_heating = float(attributes["today_heating"])
-            if "last_update" in attributes:
-                self._last_update = datetime.datetime.fromisoformat(attributes["last_update"])
-            if "last_state" in attributes:
-                self._last_state = attributes["last_state"]
+    def _to_counter(self):
+        return {"total": self._today_heating, "previous": self._state}
+
+    def _from_counter(self, counter):
+        self._today_heating = counter["total"]
+        self._state = counter["previous"]
+
+    def _from_legacy(self, last_state):
+        self._state = float(last_state.state)
+        if "today_heating" in last_state.attributes:
+            self._today_heating = float(last_state.attributes["today_heating"])
+        self._from_legacy_common(last_state.attributes)
 
     @property
     def state(self):
@@ -173,117 +249,106 @@ class StatisticaCentralaIeriSensor(SensorEntity, RestoreEntity):
     def extra_state_attributes(self):
         return {
             "today_heating": round(self._today_heating, 2),
-            "last_update": self._last_update.isoformat(),
-            "last_state": self._last_state,
         }
 
-    def update(self):
+    async def async_update(self):
         now = datetime.datetime.now()
-        climate_state = self.hass.states.get(self._climate_entity_id)
-        hvac_action = STATE_UNKNOWN
-        if climate_state:
-            hvac_action = climate_state.attributes.get("hvac_action", STATE_UNKNOWN)
+        hvac_action = self._hvac_action()
 
         time_diff = (now - self._last_update).total_seconds() / 3600.0
         if self._last_state == "heating":
             self._today_heating += time_diff
 
         # if new day => move today's total to "yesterday"
-        if now.date() != self._last_update.date():
+        rollover = now.date() != self._last_update.date()
+        if rollover:
             self._state = self._today_heating
             self._today_heating = 0.0
 
         self._last_state = hvac_action
         self._last_update = now
+        self._save_counter(force=rollover)
 
 
-class StatisticaCentralaLunaCurentaSensor(SensorEntity, RestoreEntity):
+class StatisticaCentralaLunaCurentaSensor(PhasedPollMixin, AccumulatorMixin, SensorEntity, RestoreEntity):
     """
     Tracks heating time for the current month.
     Resets at the start of each month.
     """
-    def __init__(self, climate_entity_id):
+    _counter_key = "this_month_heater_history"
+
+    def __init__(self, climate_entity_id, accumulators):
         self._climate_entity_id = climate_entity_id
+        self._accumulators = accumulators
         self._attr_name = "This Month Heater History"
         self._attr_unique_id = f"{climate_entity_id}_this_month_heater_history"
-        self._state = 0.0  # This month's total heating hours
-        self._monthly_heating = 0.0
+        self._monthly_heating = 0.0  # This month's total heating hours
         self._last_update = datetime.datetime.now()
         self._last_state = STATE_UNKNOWN
+        self._restored = self._restore_counter()
 
-    async def async_added_to_hass(self):
-        """Restore state on startup."""
-        await super().async_added_to_hass()
-        last_state = await self.async_get_last_state()
-        if last_state:
-            # restore to _monthly_heating
-            self._monthly_heating = float(last_state.state)
-            attributes = last_state.attributes
-            if "last_update" in attributes:
-                self._last_update = datetime.datetime.fromisoformat(attributes["last_update"])
-            if "last_state" in attributes:
-                self._last_state = attributes["last_state"]
+    def _to_counter(self):
+        return {"total": self._monthly_heating}
+
+    def _from_counter(self, counter):
+        self._monthly_heating = counter["total"]
 
-        # initialize _state to _monthly_heating on restore
-        self._state = self._monthly_heating
+    def _from_legacy(self, last_state):
+        self._monthly_heating = float(last_state.state)
+        self._from_legacy_common(last_state.attributes)
 
     @property
     def state(self):
         return round(self._monthly_heating, 2)  # display _monthly_heating as state
 
-    @property
-    def extra_state_attributes(self):
-        return {
-            "last_update": self._last_update.isoformat(),
-            "last_state": self._last_state,
-        }
-
-    def update(self):
+    async def async_update(self):
         now = datetime.datetime.now()
-        climate_state = self.hass.states.get(self._climate_entity_id)
-        hvac_action = STATE_UNKNOWN
-        if climate_state:
-            hvac_action = climate_state.attributes.get("hvac_action", STATE_UNKNOWN)
+        hvac_action = self._hvac_action()
 
         time_diff = (now - self._last_update).total_seconds() / 3600.0
         if self._last_state == "heating":
             self._monthly_heating += time_diff
 
         # if new month => reset this month's heating
-        if now.month != self._last_update.month:
+        rollover = now.month != self._last_update.month
+        if rollover:
             self._monthly_heating = 0.0
 
         self._last_state = hvac_action
         self._last_update = now
+        self._save_counter(force=rollover)
 
 
-class StatisticaCentralaLunaTrecutaSensor(SensorEntity, RestoreEntity):
+class StatisticaCentralaLunaTrecutaSensor(PhasedPollMixin, AccumulatorMixin, SensorEntity, RestoreEntity):
     """
     Tracks heating time for the last month.
     Updates at the start of each month.
     """
-    def __init__(self, climate_entity_id):
+    _counter_key = "last_month_heater_history"
+
+    def __init__(self, climate_entity_id, accumulators):
         self._climate_entity_id = climate_entity_id
+        self._accumulators = accumulators
         self._attr_name = "Last Month Heater History"
         self._attr_unique_id = f"{climate_entity_id}_last_month_heater_history"
         self._state = 0.0  # Last month's total heating hours
         self._this_month_heating = 0.0
         self._last_update = datetime.datetime.now()
         self._last_state = STATE_UNKNOWN
+        self._restored = self._restore_counter()
 
-    async def async_added_to_hass(self):
-        """Restore state on startup."""
-        await super().async_added_to_hass()
-        last_state = await self.async_get_last_state()
-        if last_state:
-            self._state = float(last_state.state)  # restore last month's history
-            attributes = last_state.attributes
-            if "this_month_heating" in attributes:
-                self._this_month_heating = float(attributes["this_month_heating"])
-            if "last_update" in attributes:
-                self._last_update = datetime.datetime.fromisoformat(attributes["last_update"])
-            if "last_state" in attributes:
-                self._last_state = attributes["last_state"]
+    def _to_counter(self):
+        return {"total": self._this_month_heating, "previous": self._state}
+
+    def _from_counter(self, counter):
+        self._this_month_heating = counter["total"]
+        self._state = counter["previous"]
+
+    def _from_legacy(self, last_state):
+        self._state = float(last_state.state)  # restore last month's history
+        if "this_month_heating" in last_state.attributes:
+            self._this_month_heating = float(last_state.attributes["this_month_heating"])
+        self._from_legacy_common(last_state.attributes)
 
     @property
     def state(self):
@@ -293,31 +358,28 @@ class StatisticaCentralaLunaTrecutaSensor(SensorEntity, RestoreEntity):
     def extra_state_attributes(self):
         return {
             "this_month_heating": round(self._this_month_heating, 2),
-            "last_update": self._last_update.isoformat(),
-            "last_state": self._last_state,
         }
 
-    def update(self):
+    async def async_update(self):
         now = datetime.datetime.now()
-        climate_state = self.hass.states.get(self._climate_entity_id)
-        hvac_action = STATE_UNKNOWN
-        if climate_state:
-            hvac_action = climate_state.attributes.get("hvac_action", STATE_UNKNOWN)
+        hvac_action = self._hvac_action()
 
         time_diff = (now - self._last_update).total_seconds() / 3600.0
         if self._last_state == "heating":
             self._this_month_heating += time_diff
 
         # if new month => move this month's total to "last month"
-        if now.month != self._last_update.month:
+        rollover = now.month != self._last_update.month
+        if rollover:
             self._state = self._this_month_heating  # current month becomes last month
             self._this_month_heating = 0.0          # reset current month counter
 
         self._last_state = hvac_action
         self._last_update = now
+        self._save_counter(force=rollover)
 
 
-class DurataIncalzireSensor(SensorEntity):
+class DurataIncalzireSensor(PhasedPollMixin, SensorEntity):
     """
     Replaces:
       - platform: history_stats
@@ -374,11 +436,26 @@ from homeassistant.const import (
     UnitOfTemperature,
 )
 
-class SalusCurrentTempSensor(SensorEntity):
-    """Sensor to expose the current temperature from the Salus climate entity."""
+class SalusCurrentTempSensor(PhasedPollMixin, SensorEntity):
+    """
+    Sensor to expose the current temperature from the Salus climate entity.
+
+    Every reading is also recorded in a downsampled temperature history, so
+    the last hour/day/month/year min, max and average are available as attributes
+    (and through the salus.get_temperature_history service) without
+    querying the recorder. The heating intervals are logged next to it for
+    the salus.export service.
+    """
+
+    # The window aggregates change on every update. The recorder already
+    # keeps the temperature itself, so it does not store them.
+    _unrecorded_attributes = frozenset(
+        f"{window}_{stat}" for window in TIERS for stat in ("min", "max", "avg")
+    )
 
-    def __init__(self, climate_entity_id: str):
+    def __init__(self, climate_entity_id: str, entry_id: str):
         self._climate_entity_id = climate_entity_id
+        self._entry_id = entry_id
         self._attr_name = "Salus Current Temperature"
         self._attr_unique_id = f"{climate_entity_id}_current_temperature"
         # Provide device_class & state_class for improved UI
@@ -386,13 +463,48 @@ class SalusCurrentTempSensor(SensorEntity):
         self._attr_state_class = SensorStateClass.MEASUREMENT
         self._attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
         self._state = STATE_UNKNOWN
+        self._history = ThermostatHistory()
+        self._store = None
+        self._save_pending = False
+
+    async def async_added_to_hass(self):
+        """Load the persisted history."""
+        await super().async_added_to_hass()
+        self._store = HistoryStore(self.hass, self._entry_id)
+        data = await self._store.async_load()
+        if data:
+            try:
+                self._history = ThermostatHistory.from_dict(data)
+            except (AttributeError, TypeError, ValueError) as err:
+                _LOGGER.warning("Discarding invalid Salus history: %s", err)
+        self.hass.data[DOMAIN][DATA_HISTORY][self.entity_id] = self._history
+
+    async def async_will_remove_from_hass(self):
+        """Flush the history to disk."""
+        await super().async_will_remove_from_hass()
+        self.hass.data[DOMAIN][DATA_HISTORY].pop(self.entity_id, None)
+        # async_save also cancels the pending delayed save
+        self._save_pending = False
+        await self._store.async_save(self._history.to_dict())
 
     @property
     def native_value(self):
         """Return the current temperature as a float or Unknown/Unavailable."""
         return self._state
 
-    def update(self):
+    @property
+    def extra_state_attributes(self):
+        """Return the min/max/avg of every history window."""
+        attributes = {}
+        for window, summary in self._history.temperature.summaries(time.time()).items():
+            if summary is None:
+                continue
+            attributes[f"{window}_min"] = round(summary["min"], 2)
+            attributes[f"{window}_max"] = round(summary["max"], 2)
+            attributes[f"{window}_avg"] = round(summary["avg"], 2)
+        return attributes
+
+    async def async_update(self):
         """Fetch the current temperature from the Salus climate entity."""
         climate_state = self.hass.states.get(self._climate_entity_id)
         if not climate_state:
@@ -402,3 +514,22 @@ class SalusCurrentTempSensor(SensorEntity):
         # The climate entity's 'current_temperature' attribute is the key
         temperature = climate_state.attributes.get("current_temperature", STATE_UNKNOWN)
         self._state = temperature
+
+        now = time.time()
+        self._history.heating.record(
+            now, climate_state.attributes.get("hvac_action") == "heating"
+        )
+        if isinstance(temperature, (int, float)):
+            self._history.temperature.add(now, float(temperature))
+
+        # the first update runs before async_added_to_hass() created the store.
+        # async_delay_save restarts its timer on every call, so only schedule
+        # a write when none is pending, or it would never fire
+        if self._store is not None and not self._save_pending:
+            self._save_pending = True
+            self._store.async_delay_save(self._history_to_save, HISTORY_SAVE_DELAY)
+
+    def _history_to_save(self):
+        """Return the document for the delayed save, which is now writing."""
+        self._save_pending = False
+        return self._history.to_dict()
@@ -0,0 +1,150 @@
+"""
+Local HTTP access to the latest Salus device readings.
+
+The climate entities publish every parsed poll into a SnapshotCache. The
+SalusSnapshotView serves that cache as JSON so that other local consumers
+(Grafana, scripts, another Home Assistant) share the integration's single
+cloud poll instead of logging into salus-it500.com themselves.
+"""
+import asyncio
+import datetime
+import secrets
+
+from aiohttp import hdrs, web
+
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.core import callback
+
+# Upper bound for ?wait=, in seconds
+MAX_LONG_POLL = 60
+
+
+class SnapshotCache:
+    """Latest values of every Salus device, versioned for ETag support."""
+
+    def __init__(self):
+        self._snapshots = {}
+        # random per-process prefix, so an ETag from before a restart never matches
+        self._instance = secrets.token_hex(4)
+        self._version = 0
+        self._changed = asyncio.Event()
+
+    @property
+    def etag(self):
+        """Return the ETag of the current content."""
+        return f'"{self._instance}-{self._version}"'
+
+    def as_dict(self):
+        """Return the snapshots keyed by device id."""
+        return dict(self._snapshots)
+
+    @callback
+    def _bump(self):
+        self._version += 1
+        # wake up every long-poll waiter and arm a fresh event for the next change
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    @callback
+    def async_publish(self, device_id, values):
+        """
+        Store the latest values of a device after a successful poll.
+
+        last_updated moves on every poll, but only a changed value or a device
+        becoming available again bumps the ETag.
+        """
+        now = datetime.datetime.now(datetime.timezone.utc).isoformat()
+        previous = self._snapshots.get(device_id)
+        if previous is not None and previous["values"] == values:
+            previous["last_updated"] = now
+            if previous["available"]:
+                return
+            previous["available"] = True
+        else:
+            self._snapshots[device_id] = {
+                "values": values,
+                "available": True,
+                "last_changed": now,
+                "last_updated": now,
+            }
+        self._bump()
+
+    @callback
+    def async_mark_unavailable(self, device_id):
+        """Flag the values of a device as stale after a failed poll."""
+        previous = self._snapshots.get(device_id)
+        if previous is None or not previous["available"]:
+            return
+        previous["available"] = False
+        self._bump()
+
+    @callback
+    def async_remove(self, device_id):
+        """Forget a device that is being unloaded."""
+        if self._snapshots.pop(device_id, None) is not None:
+            self._bump()
+
+    async def async_wait_for_change(self, etag, timeout):
+        """Wait until the content no longer matches etag, or timeout expires."""
+        if etag != self.etag:
+            return True
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+
+def _etag_matches(header, etag):
+    """Return True if an If-None-Match header lists etag ("*" is handled by the view)."""
+    if not header:
+        return False
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+class SalusSnapshotView(HomeAssistantView):
+    """
+    Serve the cached device snapshots.
+
+    GET /api/salus/snapshot returns every device. Send the previous ETag in
+    If-None-Match to get a 304 when nothing changed, and add ?wait=<seconds>
+    to long-poll: the request is held until a value changes (or the wait
+    expires, which again answers 304). If-None-Match: * answers 304 as soon
+    as any snapshot exists and never waits.
+    """
+
+    url = "/api/salus/snapshot"
+    name = "api:salus:snapshot"
+    requires_auth = True
+
+    def __init__(self, cache):
+        """Initialize the view."""
+        self._cache = cache
+
+    async def get(self, request):
+        """Return the latest snapshots."""
+        if_none_match = request.headers.get(hdrs.IF_NONE_MATCH)
+        if if_none_match and if_none_match.strip() == "*":
+            etag = self._cache.etag
+            if self._cache.as_dict():
+                return web.Response(status=304, headers={hdrs.ETAG: etag})
+            return self.json({}, headers={hdrs.ETAG: etag})
+
+        try:
+            wait = min(float(request.query.get("wait", 0)), MAX_LONG_POLL)
+        except ValueError:
+            return self.json_message("wait must be a number of seconds", 400)
+
+        if wait > 0 and _etag_matches(if_none_match, self._cache.etag):
+            await self._cache.async_wait_for_change(self._cache.etag, wait)
+
+        etag = self._cache.etag
+        if _etag_matches(if_none_match, etag):
+            return web.Response(status=304, headers={hdrs.ETAG: etag})
+        return self.json(self._cache.as_dict(), headers={hdrs.ETAG: etag})
@@ -0,0 +1,113 @@
+"""
+Persistence of the Salus history and heating counters.
+
+HistoryStore holds the ThermostatHistory document of a config entry and
+migrates the layouts written by older versions.
+
+All counters of a config entry live in one versioned Store document, so a
+crash can never leave half of them updated. Regular saves are written at
+most SAVE_DELAY seconds after a change; window rollovers (new day / new
+month) are written immediately, and any pending save is flushed by the
+Store when Home Assistant shuts down.
+"""
+import logging
+
+import voluptuous as vol
+
+from homeassistant.core import callback
+from homeassistant.helpers.storage import Store
+import homeassistant.helpers.config_validation as cv
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+# 1: temperature tiers only, 2: {"temperature": ..., "heating": ...}
+HISTORY_STORAGE_VERSION = 2
+
+# 1: {key: COUNTER_SCHEMA}
+ACCUMULATOR_STORAGE_VERSION = 1
+
+# Longest time, in seconds, changed counters wait before being written to disk
+SAVE_DELAY = 60
+
+COUNTER_SCHEMA = vol.Schema({
+    vol.Required("last_update"): cv.datetime,
+    vol.Required("last_state"): cv.string,
+    vol.Required("total"): vol.Coerce(float),
+    vol.Optional("previous", default=0.0): vol.Coerce(float),
+})
+
+DOCUMENT_SCHEMA = vol.Schema({cv.string: COUNTER_SCHEMA})
+
+
+class HistoryStore(Store):
+    """Store of a ThermostatHistory document."""
+
+    def __init__(self, hass, entry_id):
+        """Initialize the store."""
+        super().__init__(
+            hass, HISTORY_STORAGE_VERSION, f"{DOMAIN}.{entry_id}.temperature_history"
+        )
+
+    async def _async_migrate_func(self, old_major_version, old_minor_version, old_data):
+        """Wrap the version 1 temperature tiers into the current layout."""
+        if old_major_version == 1:
+            return {"temperature": old_data, "heating": {}}
+        return old_data
+
+
+class AccumulatorStore:
+    """Single Store document holding every heating counter of a thermostat."""
+
+    def __init__(self, hass, entry_id):
+        """Initialize the store."""
+        self._store = Store(
+            hass, ACCUMULATOR_STORAGE_VERSION, f"{DOMAIN}.{entry_id}.accumulators"
+        )
+        self._hass = hass
+        self._counters = {}
+        self._save_pending = False
+
+    async def async_load(self):
+        """Load and validate the document; invalid content is discarded."""
+        data = await self._store.async_load()
+        if not data:
+            return
+        try:
+            self._counters = DOCUMENT_SCHEMA(data)
+        except vol.Invalid as err:
+            _LOGGER.warning("Discarding invalid Salus heating counters: %s", err)
+
+    def get(self, key):
+        """Return the counter stored under key, or None."""
+        return self._counters.get(key)
+
+    def _to_dict(self):
+        return {
+            key: {**counter, "last_update": counter["last_update"].isoformat()}
+            for key, counter in self._counters.items()
+        }
+
+    @callback
+    def async_set(self, key, counter, force=False):
+        """Update a counter; force writes it now instead of debouncing."""
+        self._counters[key] = counter
+        if force:
+            self._hass.async_create_task(self.async_flush())
+        elif not self._save_pending:
+            # calling async_delay_save again would restart its timer, and with
+            # updates every 15 s the write would be postponed forever
+            self._save_pending = True
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    def _data_to_save(self):
+        """Build the document when the delayed save writes it."""
+        self._save_pending = False
+        return self._to_dict()
+
+    async def async_flush(self):
+        """Write the document to disk now."""
+        # async_save replaces any delayed save that is still pending
+        self._save_pending = False
+        await self._store.async_save(self._to_dict())
@@ -0,0 +1,124 @@
+"""Tests for the device values of the Salus thermostat."""
+import time
+from types import SimpleNamespace
+
+from custom_components.salus.climate import (
+    TOKEN_LIFETIME,
+    TOKEN_PHASE_GROUP,
+    SalusThermostat,
+    parse_device_values,
+)
+from custom_components.salus.const import DATA_PHASES, DOMAIN
+from custom_components.salus.phasing import PhaseAllocator
+from custom_components.salus.snapshot import SnapshotCache
+
+VALUES = {
+    "CH1currentSetPoint": "22.0",
+    "CH1currentRoomTemp": "21.5",
+    "frost": "7",
+    "CH1heatOnOffStatus": "1",
+    "CH1heatOnOff": "0",
+}
+
+
+class _Response:
+    status_code = 200
+
+    def __init__(self, payload):
+        self._payload = payload
+
+    def json(self):
+        if self._payload is None:
+            raise ValueError("no JSON")
+        return self._payload
+
+
+class _Session:
+    """Answers set.php with echo and counts ajax_device_values.php fetches."""
+
+    def __init__(self, echo):
+        self.echo = echo
+        self.fetches = 0
+
+    def post(self, url, **kwargs):
+        return _Response(self.echo)
+
+    def get(self, url, **kwargs):
+        self.fetches += 1
+        return _Response(VALUES)
+
+
+def _thermostat(echo):
+    thermostat = SalusThermostat("Salus", "user", "secret", "1", SnapshotCache())
+    thermostat._session = _Session(echo)
+    thermostat._token = "token"
+    thermostat._token_deadline = time.time() + 3600
+    return thermostat
+
+
+def test_parse_hidden_inputs_and_script_values():
+    page = """
+    <input id="token" type="hidden" value="abc" />
+    <input id="CH1currentRoomTemp" type="hidden" value="21.5" />
+    <script>var values = {"CH1currentSetPoint":"22.0","frost":"7","CH1heatOnOff":"0"};</script>
+    """
+    assert parse_device_values(page) == {
+        "CH1currentRoomTemp": "21.5",
+        "CH1currentSetPoint": "22.0",
+        "frost": "7",
+        "CH1heatOnOff": "0",
+    }
+
+
+def test_parse_requires_room_temperature_and_set_point():
+    assert parse_device_values("<html></html>") is None
+    assert parse_device_values('{"CH1currentRoomTemp": "21.5"}') is None
+
+
+def test_set_echo_replaces_only_the_next_fetch():
+    thermostat = _thermostat(echo=VALUES)
+    thermostat._set_temperature(22.0)
+
+    thermostat._get_data()
+    assert thermostat._session.fetches == 0
+    assert thermostat.current_temperature == 21.5
+
+    # values fetched by a poll never skip the poll after it
+    thermostat._get_data()
+    thermostat._get_data()
+    assert thermostat._session.fetches == 2
+
+
+def test_partial_or_missing_echo_does_not_skip_the_fetch():
+    for echo in ({"CH1currentSetPoint": "22.0", "CH1currentRoomTemp": "21.5"}, None):
+        thermostat = _thermostat(echo)
+        thermostat._set_temperature(22.0)
+        thermostat._get_data()
+        assert thermostat._session.fetches == 1
+
+
+def test_token_refreshes_move_to_their_phase_when_thermostats_join():
+    allocator = PhaseAllocator()
+    login = 1_700_000_000
+    thermostats = []
+    for index in range(4):
+        thermostat = _thermostat(echo=None)
+        thermostat.hass = SimpleNamespace(data={DOMAIN: {DATA_PHASES: allocator}})
+        thermostat.entity_id = f"climate.salus_{index}"
+        # logged in by update_before_add, before taking a token phase
+        thermostat._token_timestamp = login
+        thermostat._token_deadline = thermostat._next_token_refresh(login)
+        thermostats.append(thermostat)
+    assert len({thermostat._token_deadline for thermostat in thermostats}) == 1
+
+    for thermostat in thermostats:
+        allocator.async_register(
+            TOKEN_PHASE_GROUP, thermostat.entity_id, thermostat._async_rebalance_token
+        )
+    deadlines = [thermostat._token_deadline for thermostat in thermostats]
+    assert [deadline % TOKEN_LIFETIME for deadline in deadlines] == [0, 900, 1800, 2700]
+    assert all(login < deadline <= login + TOKEN_LIFETIME for deadline in deadlines)
+
+    allocator.async_unregister(TOKEN_PHASE_GROUP, "climate.salus_3")
+    deadlines = [thermostat._token_deadline for thermostat in thermostats[:3]]
+    assert [deadline % TOKEN_LIFETIME for deadline in deadlines] == [0, 1200, 2400]
@@ -0,0 +1,78 @@
+"""Tests for the Salus history export."""
+import json
+
+import pytest
+
+from custom_components.salus.export import (
+    iter_chunks,
+    iter_csv,
+    iter_jsonl,
+    write_export,
+)
+from custom_components.salus.history import ThermostatHistory
+
+START = 1_700_000_000
+
+RECORD = {
+    "entity_id": "sensor.salus_current_temperature",
+    "kind": "heating",
+    "resolution": None,
+    "start": "2023-11-14T22:13:20+00:00",
+    "end": None,
+    "min": None,
+    "max": None,
+    "avg": None,
+    "samples": None,
+}
+
+
+def _snapshot():
+    history = ThermostatHistory()
+    for step in range(100):
+        history.temperature.add(START + step * 15, 20.0 + step % 3)
+    history.heating.record(START, True)
+    history.heating.record(START + 600, False)
+    return [("sensor.salus_current_temperature", history.to_dict())]
+
+
+def test_iter_chunks_groups_lines():
+    assert list(iter_chunks(["a\n", "b\n", "c\n"], size=2)) == ["a\nb\n", "c\n"]
+    assert list(iter_chunks([], size=2)) == []
+
+
+def test_formats():
+    csv_lines = list(iter_csv([RECORD]))
+    assert csv_lines[0].startswith("entity_id,kind,resolution,")
+    assert csv_lines[1].startswith("sensor.salus_current_temperature,heating,")
+    assert json.loads(list(iter_jsonl([RECORD]))[0]) == RECORD
+
+
+def test_write_export(tmp_path):
+    path = tmp_path / "salus_exports" / "out.jsonl"
+    lines = write_export(str(path), _snapshot(), START, START + 3600, "jsonl")
+
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert len(records) == lines
+    assert {record["kind"] for record in records} == {"temperature", "heating"}
+    assert sum(r["samples"] for r in records if r["kind"] == "temperature") == 100
+    assert not (tmp_path / "salus_exports" / "out.jsonl.tmp").exists()
+
+
+def test_write_export_never_overwrites(tmp_path):
+    path = tmp_path / "out.csv"
+    path.write_text("keep")
+    with pytest.raises(FileExistsError):
+        write_export(str(path), _snapshot(), START, START + 3600, "csv")
+    assert path.read_text() == "keep"
+
+
+def test_write_export_removes_temporary_file_on_error(tmp_path, monkeypatch):
+    def fail(*args):
+        raise OSError("disk full")
+
+    monkeypatch.setattr("custom_components.salus.export.os.replace", fail)
+    path = tmp_path / "out.csv"
+    with pytest.raises(OSError):
+        write_export(str(path), _snapshot(), START, START + 3600, "csv")
+    assert not path.exists()
+    assert not (tmp_path / "out.csv.tmp").exists()
@@ -0,0 +1,122 @@
+"""Tests for the in-memory Salus history."""
+import random
+
+from custom_components.salus.history import (
+    HeatingLog,
+    TemperatureHistory,
+    ThermostatHistory,
+    _Tier,
+)
+
+START = 1_700_000_000
+
+
+def test_tier_matches_brute_force_window():
+    """Sliding min/max/avg equal a full scan of the window, gaps included."""
+    rng = random.Random(42)
+    tier = _Tier(15, 240)
+    samples = []
+    now = START
+    for _ in range(3000):
+        now += rng.choice([3, 7, 15, 15, 40, 900])
+        value = round(rng.uniform(10, 30), 1)
+        tier.add(now, value)
+        samples.append((now, value))
+
+        oldest = now // 15 - 240
+        window = [v for ts, v in samples if ts // 15 > oldest]
+        summary = tier.summary(now)
+        assert summary["min"] == min(window)
+        assert summary["max"] == max(window)
+        assert abs(summary["avg"] - sum(window) / len(window)) < 1e-6
+        assert summary["count"] == len(window)
+
+
+def test_tier_empties_after_long_gap():
+    tier = _Tier(15, 240)
+    tier.add(START, 20.0)
+    assert tier.summary(START + 3600 * 5) is None
+    assert tier.first() is None
+
+
+def test_tier_ignores_samples_going_backwards():
+    tier = _Tier(15, 240)
+    tier.add(START, 20.0)
+    tier.add(START - 60, 5.0)
+    assert tier.summary(START)["min"] == 20.0
+
+
+def test_round_trip_keeps_summaries():
+    history = TemperatureHistory()
+    for step in range(2000):
+        history.add(START + step * 60, 15 + step % 11)
+    restored = TemperatureHistory.from_dict(history.to_dict())
+    now = START + 2000 * 60
+    assert restored.summaries(now) == history.summaries(now)
+
+
+def test_series_reports_every_sample_once_in_order():
+    history = TemperatureHistory()
+    end = START
+    for _ in range(60 * 24 * 40):  # 40 days, one sample per minute
+        end += 60
+        history.add(end, 20.0)
+
+    rows = list(history.series(0, end + 1))
+    starts = [row[1] for row in rows]
+    assert starts == sorted(starts)
+    assert {row[0] for row in rows} == {"hour", "day", "month", "year"}
+    first = history.first()
+    expected = sum(1 for step in range(1, 60 * 24 * 40 + 1) if START + step * 60 >= first)
+    assert sum(row[5] for row in rows) == expected
+
+
+def test_series_uses_raw_samples_for_a_young_history():
+    """A history younger than one coarse bucket is not reported twice."""
+    history = TemperatureHistory()
+    for step in range(100):
+        history.add(START + step * 15, 20.0)
+    rows = list(history.series(START, START + 3600))
+    assert {row[0] for row in rows} == {"hour"}
+    assert sum(row[5] for row in rows) == 100
+
+
+def test_series_respects_the_requested_range():
+    history = TemperatureHistory()
+    for step in range(240):
+        history.add(START + step * 15, 20.0)
+    rows = list(history.series(START + 600, START + 1200))
+    assert rows
+    # buckets overlapping the range are included
+    assert all(row[1] + 15 > START + 600 and row[1] < START + 1200 for row in rows)
+
+
+def test_heating_log_records_and_wraps():
+    log = HeatingLog(size=2)
+    for start in (0, 100, 200):
+        log.record(start, True)
+        log.record(start + 10, False)
+    log.record(300, True)
+    assert list(log.intervals(0, 1000)) == [(100, 110), (200, 210), (300, None)]
+    assert log.first() == 100
+
+
+def test_heating_log_restore_closes_running_interval_at_last_sample():
+    log = HeatingLog()
+    log.record(100, True)
+    log.record(200, True)
+
+    restored = HeatingLog.from_dict(log.to_dict())
+    restored.record(5000, False)
+    assert list(restored.intervals(0, 10_000)) == [(100, 200)]
+
+
+def test_thermostat_history_round_trip():
+    history = ThermostatHistory()
+    history.temperature.add(START, 21.5)
+    history.heating.record(START, True)
+    history.heating.record(START + 60, False)
+
+    restored = ThermostatHistory.from_dict(history.to_dict())
+    assert restored.to_dict() == history.to_dict()
+    assert restored.first() == history.first()
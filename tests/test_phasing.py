@@ -0,0 +1,45 @@
+"""Tests for the Salus poll phase allocator."""
+from custom_components.salus.phasing import PhaseAllocator
+
+
+def test_offsets_are_spread_evenly():
+    allocator = PhaseAllocator()
+    for key in ("a", "b", "c", "d"):
+        allocator.async_register("poll", key)
+    assert [allocator.offset("poll", key, 60) for key in "abcd"] == [0, 15, 30, 45]
+
+
+def test_groups_are_independent():
+    allocator = PhaseAllocator()
+    allocator.async_register("poll", "a")
+    allocator.async_register("poll", "b")
+    allocator.async_register("token", "a")
+    assert allocator.offset("poll", "b", 60) == 30
+    assert allocator.offset("token", "a", 3600) == 0
+
+
+def test_register_and_unregister_rebalance_the_group():
+    allocator = PhaseAllocator()
+    calls = []
+    allocator.async_register("poll", "a", lambda: calls.append("a"))
+    allocator.async_register("poll", "b", lambda: calls.append("b"))
+    assert calls == ["a", "a", "b"]
+
+    calls.clear()
+    allocator.async_unregister("poll", "a")
+    assert calls == ["b"]
+    assert allocator.offset("poll", "b", 60) == 0
+
+    allocator.async_unregister("poll", "b")
+    allocator.async_unregister("poll", "b")
+    assert allocator.offset("poll", "b", 60) == 0
+
+
+def test_delay_reaches_the_next_phase():
+    allocator = PhaseAllocator()
+    allocator.async_register("poll", "a")
+    allocator.async_register("poll", "b")
+    for now in (1000.0, 1029.5, 1030.0, 1059.0):
+        delay = allocator.delay("poll", "b", 60, now)
+        assert 0 < delay <= 60
+        assert (now + delay - 30) % 60 == 0
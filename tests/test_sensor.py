@@ -0,0 +1,88 @@
+"""Tests for the Salus heating counter sensors."""
+import asyncio
+import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from custom_components.salus.sensor import AccumulatorMixin, StatisticaCentralaIeriSensor
+
+from .test_storage import make_store
+
+CLIMATE = "climate.salus_thermostat"
+
+
+def make_sensor(accumulators, hvac_action="heating"):
+    sensor = StatisticaCentralaIeriSensor(CLIMATE, accumulators)
+    sensor.entity_id = "sensor.yesterday_heater_history"
+    climate = SimpleNamespace(attributes={"hvac_action": hvac_action})
+    sensor.hass = SimpleNamespace(states=SimpleNamespace(get=lambda entity_id: climate))
+    return sensor
+
+
+async def add_to_hass(sensor):
+    # only the counter part; PhasedPollMixin would start polling
+    await AccumulatorMixin.async_added_to_hass(sensor)
+    await asyncio.gather(*sensor._accumulators._hass.tasks)
+
+
+@pytest.mark.asyncio
+async def test_legacy_state_is_migrated_once(monkeypatch):
+    accumulators = make_store(monkeypatch)
+    await accumulators.async_load()
+    sensor = make_sensor(accumulators)
+    sensor.async_get_last_state = AsyncMock(return_value=SimpleNamespace(
+        state="2.5",
+        attributes={
+            "today_heating": "0.75",
+            "last_update": "2025-01-01T10:00:00",
+            "last_state": "heating",
+        },
+    ))
+    await add_to_hass(sensor)
+
+    counter = accumulators.get("yesterday_heater_history")
+    assert counter["total"] == 0.75
+    assert counter["previous"] == 2.5
+    assert counter["last_update"] == datetime.datetime(2025, 1, 1, 10, 0)
+    assert len(accumulators._store.saved) == 1
+
+    # the next start reads the store and never looks at the old state again
+    restarted = make_sensor(accumulators)
+    restarted.async_get_last_state = AsyncMock()
+    await add_to_hass(restarted)
+    restarted.async_get_last_state.assert_not_called()
+    assert restarted.state == 2.5
+
+
+@pytest.mark.asyncio
+async def test_unreadable_legacy_state_still_starts_a_counter(monkeypatch):
+    accumulators = make_store(monkeypatch)
+    sensor = make_sensor(accumulators)
+    sensor.async_get_last_state = AsyncMock(
+        return_value=SimpleNamespace(state="unknown", attributes={})
+    )
+    await add_to_hass(sensor)
+    assert accumulators.get("yesterday_heater_history")["previous"] == 0.0
+
+
+@pytest.mark.asyncio
+async def test_rollover_is_saved_immediately(monkeypatch):
+    accumulators = make_store(monkeypatch)
+    fake = accumulators._store
+    sensor = make_sensor(accumulators, hvac_action="idle")
+    sensor._restored = True
+
+    await sensor.async_update()
+    await sensor.async_update()
+    assert fake.saved == []
+    assert len(fake.delayed) == 1
+
+    sensor._last_update -= datetime.timedelta(days=1)
+    sensor._today_heating = 3.0
+    await sensor.async_update()
+    await asyncio.gather(*accumulators._hass.tasks)
+    assert len(fake.saved) == 1
+    assert fake.saved[0]["yesterday_heater_history"]["previous"] == 3.0
+    assert fake.saved[0]["yesterday_heater_history"]["total"] == 0.0
@@ -0,0 +1,121 @@
+"""Tests for the local Salus snapshot endpoint."""
+import asyncio
+import json
+
+import pytest
+from aiohttp import hdrs
+from aiohttp.test_utils import make_mocked_request
+
+from custom_components.salus.snapshot import SalusSnapshotView, SnapshotCache
+
+VALUES = {"name": "Salus", "current_temperature": 21.5, "target_temperature": 22.0}
+
+
+def _get(view, query="", if_none_match=None):
+    headers = {hdrs.IF_NONE_MATCH: if_none_match} if if_none_match else {}
+    request = make_mocked_request("GET", f"/api/salus/snapshot{query}", headers=headers)
+    return view.get(request)
+
+
+def test_only_real_changes_bump_the_etag():
+    cache = SnapshotCache()
+    cache.async_publish("1", VALUES)
+    etag = cache.etag
+    first = dict(cache.as_dict()["1"])
+
+    cache.async_publish("1", dict(VALUES))
+    assert cache.etag == etag
+    snapshot = cache.as_dict()["1"]
+    assert snapshot["last_changed"] == first["last_changed"]
+    assert snapshot["last_updated"] >= first["last_updated"]
+
+    cache.async_publish("1", {**VALUES, "current_temperature": 21.0})
+    assert cache.etag != etag
+
+
+def test_failed_poll_marks_the_values_unavailable():
+    cache = SnapshotCache()
+    cache.async_publish("1", VALUES)
+    etag = cache.etag
+
+    cache.async_mark_unavailable("1")
+    assert cache.as_dict()["1"]["available"] is False
+    unavailable = cache.etag
+    assert unavailable != etag
+    cache.async_mark_unavailable("1")
+    assert cache.etag == unavailable
+
+    # the same values coming back still tell consumers the data is live again
+    cache.async_publish("1", VALUES)
+    assert cache.as_dict()["1"]["available"] is True
+    assert cache.etag != unavailable
+
+
+def test_etags_differ_between_caches():
+    """An ETag kept across a restart never matches the new process."""
+    assert SnapshotCache().etag != SnapshotCache().etag
+
+
+@pytest.mark.asyncio
+async def test_if_none_match_answers_304_when_unchanged():
+    cache = SnapshotCache()
+    view = SalusSnapshotView(cache)
+    cache.async_publish("1", VALUES)
+
+    response = await _get(view, if_none_match=cache.etag)
+    assert response.status == 304
+    assert response.headers[hdrs.ETAG] == cache.etag
+
+    response = await _get(view, if_none_match='"stale-1"')
+    assert response.status == 200
+    assert json.loads(response.body)["1"]["values"] == VALUES
+
+
+@pytest.mark.asyncio
+async def test_if_none_match_star():
+    cache = SnapshotCache()
+    view = SalusSnapshotView(cache)
+
+    response = await _get(view, "?wait=30", if_none_match="*")
+    assert response.status == 200
+    assert json.loads(response.body) == {}
+
+    cache.async_publish("1", VALUES)
+    response = await _get(view, "?wait=30", if_none_match="*")
+    assert response.status == 304
+
+
+@pytest.mark.asyncio
+async def test_long_poll_wakes_up_on_change():
+    cache = SnapshotCache()
+    view = SalusSnapshotView(cache)
+    cache.async_publish("1", VALUES)
+
+    pending = asyncio.ensure_future(_get(view, "?wait=30", if_none_match=cache.etag))
+    await asyncio.sleep(0)
+    cache.async_publish("1", dict(VALUES))  # nothing changed: keep waiting
+    await asyncio.sleep(0)
+    assert not pending.done()
+
+    cache.async_publish("1", {**VALUES, "target_temperature": 23.0})
+    response = await asyncio.wait_for(pending, 5)
+    assert response.status == 200
+    assert response.headers[hdrs.ETAG] == cache.etag
+    assert json.loads(response.body)["1"]["values"]["target_temperature"] == 23.0
+
+
+@pytest.mark.asyncio
+async def test_long_poll_times_out_with_304():
+    cache = SnapshotCache()
+    view = SalusSnapshotView(cache)
+    cache.async_publish("1", VALUES)
+
+    response = await _get(view, "?wait=0.05", if_none_match=cache.etag)
+    assert response.status == 304
+
+
+@pytest.mark.asyncio
+async def test_non_numeric_wait_is_rejected():
+    view = SalusSnapshotView(SnapshotCache())
+    response = await _get(view, "?wait=soon")
+    assert response.status == 400
@@ -0,0 +1,113 @@
+"""Tests for the Salus heating counter store."""
+import asyncio
+import datetime
+import logging
+from types import SimpleNamespace
+
+import pytest
+
+from custom_components.salus import storage
+from custom_components.salus.storage import SAVE_DELAY, AccumulatorStore
+
+
+class FakeStore:
+    """Records what AccumulatorStore asks of the Home Assistant Store."""
+
+    def __init__(self, hass, version, key):
+        self.key = key
+        self.stored = None
+        self.delayed = []
+        self.saved = []
+
+    async def async_load(self):
+        return self.stored
+
+    def async_delay_save(self, data_func, delay):
+        assert delay == SAVE_DELAY
+        self.delayed.append(data_func)
+
+    async def async_save(self, data):
+        self.saved.append(data)
+
+    def write_delayed(self):
+        """Run the pending delayed save like the Store timer does."""
+        self.saved.append(self.delayed[-1]())
+
+
+def make_hass():
+    tasks = []
+
+    def async_create_task(coro):
+        tasks.append(asyncio.get_running_loop().create_task(coro))
+
+    return SimpleNamespace(async_create_task=async_create_task, tasks=tasks)
+
+
+def make_store(monkeypatch, stored=None):
+    monkeypatch.setattr(storage, "Store", FakeStore)
+    accumulators = AccumulatorStore(make_hass(), "entry")
+    accumulators._store.stored = stored
+    return accumulators
+
+
+COUNTER = {
+    "last_update": "2025-01-01T10:00:00",
+    "last_state": "heating",
+    "total": "1.5",
+}
+
+
+@pytest.mark.asyncio
+async def test_load_validates_and_coerces_the_document(monkeypatch):
+    accumulators = make_store(monkeypatch, {"heater_history": COUNTER})
+    await accumulators.async_load()
+
+    counter = accumulators.get("heater_history")
+    assert counter["last_update"] == datetime.datetime(2025, 1, 1, 10, 0)
+    assert counter["total"] == 1.5
+    assert counter["previous"] == 0.0
+
+
+@pytest.mark.asyncio
+async def test_load_discards_an_invalid_document(monkeypatch, caplog):
+    bad = {**COUNTER, "last_update": "not a date"}
+    accumulators = make_store(monkeypatch, {"heater_history": bad})
+    with caplog.at_level(logging.WARNING):
+        await accumulators.async_load()
+
+    assert accumulators.get("heater_history") is None
+    assert "Discarding invalid Salus heating counters" in caplog.text
+
+
+def test_regular_saves_are_not_postponed_by_new_changes(monkeypatch):
+    accumulators = make_store(monkeypatch)
+    fake = accumulators._store
+    counter = {"last_update": datetime.datetime(2025, 1, 1), "last_state": "idle", "total": 0.0}
+
+    for total in range(8):
+        accumulators.async_set("heater_history", {**counter, "total": float(total)})
+    # one timer for the whole burst; a second call would restart it
+    assert len(fake.delayed) == 1
+
+    fake.write_delayed()
+    assert fake.saved[-1]["heater_history"]["total"] == 7.0
+    accumulators.async_set("heater_history", counter)
+    assert len(fake.delayed) == 2
+
+
+@pytest.mark.asyncio
+async def test_forced_save_writes_now_and_rearms_the_delayed_save(monkeypatch):
+    accumulators = make_store(monkeypatch)
+    fake = accumulators._store
+    counter = {"last_update": datetime.datetime(2025, 1, 1), "last_state": "idle", "total": 0.0}
+
+    accumulators.async_set("heater_history", counter)
+    accumulators.async_set("heater_history", counter, force=True)
+    await asyncio.gather(*accumulators._hass.tasks)
+    assert fake.saved == [
+        {"heater_history": {**counter, "last_update": "2025-01-01T00:00:00"}}
+    ]
+
+    # the forced save replaced the pending one, so the next change schedules again
+    accumulators.async_set("heater_history", counter)
+    assert len(fake.delayed) == 2